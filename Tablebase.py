@@ -0,0 +1,331 @@
+import argparse
+import lzma
+import os
+import random
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Retrograde tablebase for the number game.
+#
+# A string of length k over the digits 1-9 is indexed by reading it as a base-9 number (digit - 1
+# per place, first digit most significant), so one length holds 9**k entries. The value of a
+# string is its negamax value: how much the side to move gains on its opponent from here to the
+# end of the game, which is the same whichever side is to move. It only depends on the values of
+# its k - 1 children at length k - 1, so the lengths are solved bottom-up, one vectorized pass per
+# move index. Each length is built as two .npy files, the int8 values and the uint8 index of the
+# best move, which the engine opens as memory maps the first time it probes that length.
+#
+# A built length can be compressed into one .tbz file instead: the entries are cut into blocks of
+# BLOCK_SIZE, each block's values and moves compressed on their own, and an offset index up front
+# says where every block starts, so a probe only decompresses the one block it needs.
+
+NO_MOVE = 255  # Best move stored for single digits
+CHUNK_SIZE = 1 << 20  # Entries a worker solves per vectorized pass, to bound its memory
+BLOCK_SIZE = 4096  # Entries per compressed block
+BLOCK_CACHE_SIZE = 64  # Decompressed blocks kept per length
+COMPRESSED_MAGIC = b"NGTB"
+COMPRESSED_HEADER = struct.Struct("<4sBBII")  # Magic, length, method, block size, block count
+COMPRESSORS = {"zlib": (0, lambda data: zlib.compress(data, 9)), "lzma": (1, lzma.compress)}
+DECOMPRESSORS = {0: zlib.decompress, 1: lzma.decompress}
+
+# Merge rules indexed by pair = (first digit - 1) * 9 + (second digit - 1): the replacement digit
+# minus one, and the change in the mover's score difference
+PAIR_REPLACEMENT = np.zeros(81, dtype=np.int64)
+PAIR_DELTA = np.zeros(81, dtype=np.int16)
+for first_num in range(1, 10):
+    for second_num in range(1, 10):
+        pair = (first_num - 1) * 9 + (second_num - 1)
+        if first_num + second_num > 7:
+            PAIR_REPLACEMENT[pair], PAIR_DELTA[pair] = 0, 1
+        elif first_num + second_num < 7:
+            PAIR_REPLACEMENT[pair], PAIR_DELTA[pair] = 2, 1
+        else:
+            PAIR_REPLACEMENT[pair], PAIR_DELTA[pair] = 1, -1
+
+
+def values_path(directory, length):
+    return os.path.join(directory, f"values_{length}.npy")
+
+
+def moves_path(directory, length):
+    return os.path.join(directory, f"moves_{length}.npy")
+
+
+def compressed_path(directory, length):
+    return os.path.join(directory, f"table_{length}.tbz")
+
+
+def packed_index(cells, length):
+    # Tablebase index of a string packed 4 bits per digit, first digit in the highest nibble
+    index = 0
+    for shift in range(4 * (length - 1), -1, -4):
+        index = index * 9 + ((cells >> shift) & 15) - 1
+    return index
+
+
+def solve_chunk(length, child_values, start, stop):
+    # Values and best moves of the length-long strings with indices start..stop - 1, given the
+    # values of every string one digit shorter. Ties go to the leftmost move.
+    index = np.arange(start, stop, dtype=np.int64)
+    best_values = np.full(stop - start, -128, dtype=np.int16)
+    best_moves = np.zeros(stop - start, dtype=np.uint8)
+    for i in range(length - 1):
+        low_power = 9 ** (length - i - 2)
+        prefix = index // (low_power * 81)
+        pair = (index // low_power) % 81
+        child = (prefix * 9 + PAIR_REPLACEMENT[pair]) * low_power + index % low_power
+        values = PAIR_DELTA[pair] - child_values[child]
+        better = values > best_values
+        best_values[better] = values[better]
+        best_moves[better] = i
+    return best_values.astype(np.int8), best_moves
+
+
+def partial_path(path):
+    # Where a level is written until it is complete
+    return path + ".partial"
+
+
+def level_complete(directory, length):
+    return os.path.exists(values_path(directory, length)) and os.path.exists(moves_path(directory, length))
+
+
+def level_available(directory, length):
+    return level_complete(directory, length) or os.path.exists(compressed_path(directory, length))
+
+
+def solve_range(directory, length, start, stop):
+    # Worker: solve indices start..stop - 1 of a level into its shared output files, reading the
+    # finished level below through a read-only memory map
+    values = np.load(partial_path(values_path(directory, length)), mmap_mode="r+")
+    moves = np.load(partial_path(moves_path(directory, length)), mmap_mode="r+")
+    child_values = np.load(values_path(directory, length - 1), mmap_mode="r")
+    for chunk_start in range(start, stop, CHUNK_SIZE):
+        chunk_stop = min(chunk_start + CHUNK_SIZE, stop)
+        values[chunk_start:chunk_stop], moves[chunk_start:chunk_stop] = solve_chunk(length, child_values, chunk_start, chunk_stop)
+    values.flush()
+    moves.flush()
+    return stop - start
+
+
+def build_length(directory, length, executor):
+    # Solve every string of the given length. The level is split by its leading two digits, each
+    # part a contiguous index range handed to a worker, and only renamed to its final file names
+    # once every part is written.
+    size = 9 ** length
+    values = np.lib.format.open_memmap(partial_path(values_path(directory, length)), mode="w+", dtype=np.int8, shape=(size,))
+    moves = np.lib.format.open_memmap(partial_path(moves_path(directory, length)), mode="w+", dtype=np.uint8, shape=(size,))
+    if length == 1:
+        values[:] = 0
+        moves[:] = NO_MOVE
+    values.flush()
+    moves.flush()
+    del values, moves
+
+    if length > 1:
+        part_size = 9 ** (length - min(length - 1, 2))
+        futures = [executor.submit(solve_range, directory, length, start, start + part_size)
+                   for start in range(0, size, part_size)]
+        start_time = time.time()
+        done = 0
+        for future in as_completed(futures):
+            done += future.result()
+            elapsed = time.time() - start_time
+            eta = elapsed * (size - done) / done
+            print(f"\rLength {length}: {100 * done / size:5.1f}% done, ETA {eta:.0f} seconds", end="", flush=True)
+        print()
+
+    os.replace(partial_path(moves_path(directory, length)), moves_path(directory, length))
+    os.replace(partial_path(values_path(directory, length)), values_path(directory, length))
+
+
+def build_tablebase(directory, max_length, workers=None):
+    # Solve lengths 1 to max_length bottom-up. Levels already on disk are kept, so an interrupted
+    # build picks up again at the level it was working on.
+    os.makedirs(directory, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for length in range(1, max_length + 1):
+            if level_available(directory, length):
+                print(f"Length {length}: already built")
+                continue
+            if length > 1 and not level_complete(directory, length - 1):
+                # The workers need the level below as a plain memory map
+                decompress_length(directory, length - 1)
+            start_time = time.time()
+            build_length(directory, length, executor)
+            print(f"Length {length}: {9 ** length} strings solved in {time.time() - start_time:.1f} seconds")
+
+
+def compress_length(directory, length, method="zlib"):
+    # Replace a built level by its block-compressed file
+    method_id, compress = COMPRESSORS[method]
+    values = np.load(values_path(directory, length), mmap_mode="r")
+    moves = np.load(moves_path(directory, length), mmap_mode="r")
+    blocks = []
+    for start in range(0, 9 ** length, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, 9 ** length)
+        blocks.append(compress(values[start:stop].tobytes() + moves[start:stop].tobytes()))
+    offsets = np.zeros(len(blocks) + 1, dtype="<u8")
+    offsets[1:] = np.cumsum([len(block) for block in blocks])
+    path = compressed_path(directory, length)
+    with open(partial_path(path), "wb") as file:
+        file.write(COMPRESSED_HEADER.pack(COMPRESSED_MAGIC, length, method_id, BLOCK_SIZE, len(blocks)))
+        file.write(offsets.tobytes())
+        for block in blocks:
+            file.write(block)
+    del values, moves
+    os.replace(partial_path(path), path)
+    raw_size = os.path.getsize(values_path(directory, length)) + os.path.getsize(moves_path(directory, length))
+    os.remove(values_path(directory, length))
+    os.remove(moves_path(directory, length))
+    print(f"Length {length}: compressed {raw_size} bytes to {os.path.getsize(path)}")
+
+
+def decompress_length(directory, length):
+    # Turn a compressed level back into the .npy files the builder reads
+    level = CompressedLevel(compressed_path(directory, length))
+    values = np.lib.format.open_memmap(partial_path(values_path(directory, length)), mode="w+", dtype=np.int8, shape=(9 ** length,))
+    moves = np.lib.format.open_memmap(partial_path(moves_path(directory, length)), mode="w+", dtype=np.uint8, shape=(9 ** length,))
+    for block_index in range(level.block_count):
+        start = block_index * level.block_size
+        block_values, block_moves = level.read_block(block_index)
+        values[start:start + len(block_values)] = block_values
+        moves[start:start + len(block_moves)] = block_moves
+    values.flush()
+    moves.flush()
+    del values, moves
+    level.close()
+    os.replace(partial_path(moves_path(directory, length)), moves_path(directory, length))
+    os.replace(partial_path(values_path(directory, length)), values_path(directory, length))
+
+
+class RawLevel:
+    # One length read through memory maps of its .npy files
+    def __init__(self, directory, length):
+        self.values = np.load(values_path(directory, length), mmap_mode="r")
+        self.moves = np.load(moves_path(directory, length), mmap_mode="r")
+
+    def entry(self, index):
+        return int(self.values[index]), int(self.moves[index])
+
+
+class CompressedLevel:
+    # One length read from its .tbz file, keeping the most recently used blocks decompressed
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        magic, self.length, method_id, self.block_size, self.block_count = COMPRESSED_HEADER.unpack(
+            self.file.read(COMPRESSED_HEADER.size))
+        if magic != COMPRESSED_MAGIC:
+            raise ValueError(f"{path} is not a compressed tablebase file")
+        self.decompress = DECOMPRESSORS[method_id]
+        self.offsets = np.frombuffer(self.file.read(8 * (self.block_count + 1)), dtype="<u8")
+        self.data_start = COMPRESSED_HEADER.size + 8 * (self.block_count + 1)
+        self.blocks = OrderedDict()
+
+    def read_block(self, block_index):
+        # (values, moves) of one block, straight from the file
+        self.file.seek(self.data_start + int(self.offsets[block_index]))
+        data = self.decompress(self.file.read(int(self.offsets[block_index + 1] - self.offsets[block_index])))
+        size = len(data) // 2
+        return np.frombuffer(data[:size], dtype=np.int8), np.frombuffer(data[size:], dtype=np.uint8)
+
+    def entry(self, index):
+        block_index, offset = divmod(index, self.block_size)
+        block = self.blocks.get(block_index)
+        if block is None:
+            block = self.read_block(block_index)
+            self.blocks[block_index] = block
+            if len(self.blocks) > BLOCK_CACHE_SIZE:
+                self.blocks.popitem(last=False)
+        else:
+            self.blocks.move_to_end(block_index)
+        return int(block[0][offset]), int(block[1][offset])
+
+    def close(self):
+        self.file.close()
+
+
+class Tablebase:
+    # Read side of the tablebase. Finding out which lengths are on disk is cheap and happens at
+    # startup; the files of a length are only opened when it is first probed. A length that is
+    # there both ways is read from the plain memory maps.
+    def __init__(self, directory):
+        self.directory = directory
+        self.tables = {}
+        # Probing needs every length up to max_length
+        self.max_length = 0
+        while level_available(directory, self.max_length + 1):
+            self.max_length += 1
+
+    def table(self, length):
+        if length not in self.tables:
+            if level_complete(self.directory, length):
+                self.tables[length] = RawLevel(self.directory, length)
+            else:
+                self.tables[length] = CompressedLevel(compressed_path(self.directory, length))
+        return self.tables[length]
+
+    def entry(self, length, index):
+        # (value, best move index) of the string with the given tablebase index
+        return self.table(length).entry(index)
+
+    def probe(self, cells, length):
+        # Negamax value and best move index of a string packed 4 bits per digit
+        return self.table(length).entry(packed_index(cells, length))
+
+
+def verify_tablebase(tablebase, samples, seed=None):
+    # Recompute random entries from their children's entries. Returns the number that disagree.
+    # Only lengths 2 and up have children, so a tablebase without them has nothing to check.
+    errors = 0
+    if tablebase.max_length < 2:
+        return errors
+    rng = random.Random(seed)
+    for _ in range(samples):
+        length = rng.randint(2, tablebase.max_length)
+        index = rng.randrange(9 ** length)
+        value, move = tablebase.entry(length, index)
+        best_value, best_move = None, None
+        for i in range(length - 1):
+            low_power = 9 ** (length - i - 2)
+            pair = (index // low_power) % 81
+            child = ((index // (low_power * 81)) * 9 + int(PAIR_REPLACEMENT[pair])) * low_power + index % low_power
+            child_value = int(PAIR_DELTA[pair]) - tablebase.entry(length - 1, child)[0]
+            if best_value is None or child_value > best_value:
+                best_value, best_move = child_value, i
+        if (value, move) != (best_value, best_move):
+            errors += 1
+            print(f"Length {length} index {index}: stored ({value}, {move}), children give ({best_value}, {best_move})")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the number game tablebase")
+    parser.add_argument("--max-length", type=int, default=7, help="longest string length to solve")
+    parser.add_argument("--directory", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase"),
+                        help="where to write the tables")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--compress", choices=sorted(COMPRESSORS), help="compress the built levels with this method")
+    parser.add_argument("--verify", type=int, default=0, metavar="SAMPLES", help="check this many random entries against their children")
+    args = parser.parse_args()
+    build_tablebase(args.directory, args.max_length, args.workers)
+    if args.compress:
+        for length in range(1, args.max_length + 1):
+            if level_complete(args.directory, length):
+                compress_length(args.directory, length, args.compress)
+    if args.verify:
+        tablebase = Tablebase(args.directory)
+        if tablebase.max_length < 2:
+            print(f"Nothing to verify: {args.directory} has no complete level of length 2 or more")
+        else:
+            errors = verify_tablebase(tablebase, args.verify)
+            print(f"Verified {args.verify} entries: {errors} mismatches")
+
+
+if __name__ == "__main__":
+    main()
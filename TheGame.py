@@ -1,8 +1,235 @@
 import tkinter as tk
 from tkinter import messagebox
+import os
 import random
 import time
 
+try:
+    from Tablebase import Tablebase
+except ImportError:
+    # The tablebase needs NumPy; without it every position is searched
+    Tablebase = None
+
+MAX_STRING_LENGTH = 25
+TABLEBASE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase")
+
+# Merge rules for every pair of adjacent digits: MERGE_TABLE[a][b] = (replacement, change in the
+# mover's score difference). PAIR_REPLACEMENT and PAIR_DELTA hold the same rules indexed by the
+# packed pair byte (a << 4) | b, which is what the search reads off a packed board.
+# Every move changes the mover's score difference by exactly 1: +1 unless the pair sums to 7, -1 if
+# it does. So once no 7-sum can come any more the side to move finishes (length - 1) % 2 ahead, and
+# in any case the final difference has the parity of the current one plus the moves left.
+MERGE_TABLE = [[None] * 10 for _ in range(10)]
+PAIR_REPLACEMENT = [0] * 256
+PAIR_DELTA = [0] * 256
+for first_num in range(1, 10):
+    for second_num in range(1, 10):
+        if first_num + second_num > 7:
+            MERGE_TABLE[first_num][second_num] = (1, 1)
+        elif first_num + second_num < 7:
+            MERGE_TABLE[first_num][second_num] = (3, 1)
+        else:
+            MERGE_TABLE[first_num][second_num] = (2, -1)
+        pair = (first_num << 4) | second_num
+        PAIR_REPLACEMENT[pair], PAIR_DELTA[pair] = MERGE_TABLE[first_num][second_num]
+
+# Static move ordering: every pair falls into one of three classes (sum > 7, sum < 7, sum = 7)
+# with a known immediate swing, and moves are tried best swing first. PAIR_CLASS_ORDER[a][b] is
+# the rank of the pair's class, 0 for the +1 swings and 1 for the -1 swing of a 7-sum.
+PAIR_CLASS_ORDER = [[0 if MERGE_TABLE[a][b] is None or MERGE_TABLE[a][b][1] > 0 else 1 for b in range(10)]
+                    for a in range(10)]
+PAIR_ORDER = [0] * 256
+for first_num in range(1, 10):
+    for second_num in range(1, 10):
+        PAIR_ORDER[(first_num << 4) | second_num] = PAIR_CLASS_ORDER[first_num][second_num]
+
+# A pair can only sum to 7 if one of its digits is 4, 5 or 6, and a merge only ever produces 1, 2
+# or 3, so the 4-6 digits left on the board cap the number of -1 moves still to come. Boards keep
+# one bit per cell for the 4-6 digits that can still be part of a 7-sum; LIVE_COUNT[bits] is how
+# many a merge consumes, given the bits of its two cells.
+LIVE_COUNT = (0, 1, 1, 2)
+
+# Results of merging a block that can collapse into any value of one bitmask (bit v for value v)
+# with a block that can collapse into any value of another: (mask of replacements, whether one of
+# the pairs sums to 7). Filled in as MergeAnalysis needs them.
+MASK_MERGES = {}
+
+def merge_masks(left, right):
+    key = (left << 10) | right
+    result = MASK_MERGES.get(key)
+    if result is None:
+        merged, seven = 0, False
+        for first_num in range(1, 10):
+            if left >> first_num & 1:
+                for second_num in range(1, 10):
+                    if right >> second_num & 1:
+                        merged |= 1 << MERGE_TABLE[first_num][second_num][0]
+                        seven = seven or first_num + second_num == 7
+        result = MASK_MERGES[key] = (merged, seven)
+    return result
+
+# Two different merges can only give the same string if one leaves its left digit behind (the
+# replacement equals the left digit) and the other its right digit, as when merging inside a run
+# of 3s. PAIR_MAY_REPEAT marks those pairs, so only their children need a duplicate check.
+PAIR_MAY_REPEAT = [False] * 256
+for first_num in range(1, 10):
+    for second_num in range(1, 10):
+        pair = (first_num << 4) | second_num
+        PAIR_MAY_REPEAT[pair] = PAIR_REPLACEMENT[pair] in (first_num, second_num)
+
+# The history heuristic scores a move by its pair byte and by which of HISTORY_BUCKETS equal
+# slices of the string it falls in
+HISTORY_BUCKETS = 4
+
+# Half-width of the first aspiration window around the previous iteration's root value
+ASPIRATION_WINDOW = 2
+
+# Bound types stored in the transposition table
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+class SearchTimeout(Exception):
+    # Raised inside the search when the per-move time budget runs out
+    pass
+
+class MergeAnalysis:
+    # Interval dynamic program over a number string. reachable[i][j] is a bitmask (bit v for value v)
+    # of what digits i..j can collapse into by merging among themselves: the digit itself for a
+    # single digit, and 1, 2 or 3 for longer blocks depending on the merge order. sevens[i][j] is
+    # whether merges inside digits i..j can ever make a 7-sum. Both are filled in O(n^3).
+    def __init__(self, num_string):
+        n = len(num_string)
+        self.num_string = num_string
+        self.reachable = [[0] * n for _ in range(n)]
+        self.sevens = [[False] * n for _ in range(n)]
+        for i, digit in enumerate(num_string):
+            self.reachable[i][i] = 1 << digit
+        for span in range(1, n):
+            for i in range(n - span):
+                j = i + span
+                mask = 0
+                seven = self.sevens[i][j - 1] or self.sevens[i + 1][j]
+                for k in range(i, j):
+                    merged, makes_seven = merge_masks(self.reachable[i][k], self.reachable[k + 1][j])
+                    mask |= merged
+                    seven = seven or makes_seven
+                self.reachable[i][j] = mask
+                self.sevens[i][j] = seven
+
+    def can_make_seven(self, i, j):
+        # Whether digits i..j can still produce a 7-sum among themselves
+        return self.sevens[i][j]
+
+    def live_mid_digits(self):
+        # Bit i set for each 4-6 digit i that can be part of a 7-sum: some block next to it can
+        # collapse into 7 minus the digit. The others can only ever be merged into a +1 move.
+        live = 0
+        n = len(self.num_string)
+        for i, digit in enumerate(self.num_string):
+            if 4 <= digit <= 6:
+                complement = 1 << (7 - digit)
+                if (any(self.reachable[start][i - 1] & complement for start in range(i))
+                        or any(self.reachable[i + 1][end] & complement for end in range(i + 1, n))):
+                    live |= 1 << i
+        return live
+
+class Board:
+    # A number string packed 4 bits per digit into one int, first digit in the highest nibble, that
+    # the searches play moves on and take back. Digits are never 0, so the packed int identifies
+    # the string (length included) and serves directly as the transposition table key. Each move
+    # pushes an undo record of (index, score delta, previous cells, previous reversed cells,
+    # previous live mask). reversed_cells packs the same string back to front. live has bit i set
+    # when cell i is a 4-6 digit that MergeAnalysis found can still be part of a 7-sum, and
+    # mid_digits counts those bits. The analysis is of the string the board starts from, so it
+    # only gets less exact as merges happen, never wrong. Callers that already have the mask for
+    # this string pass it in as live, which skips the analysis.
+    #
+    # 8 and 9 are stored as 7: like 7, they make a sum over 7 with any digit, so the position
+    # plays the same. Every position reached from a start string is a split of it into blocks,
+    # each either an original digit or a merged 1-3, and keying on the folded digits that are
+    # left catches every split that leaves the same string, which block boundaries would not.
+    def __init__(self, num_string, live=None):
+        num_string = [7 if digit > 7 else digit for digit in num_string]
+        self.cells = 0
+        self.reversed_cells = 0
+        for digit in num_string:
+            self.cells = (self.cells << 4) | digit
+        for digit in reversed(num_string):
+            self.reversed_cells = (self.reversed_cells << 4) | digit
+        self.length = len(num_string)
+        self.live = MergeAnalysis(num_string).live_mid_digits() if live is None else live
+        self.mid_digits = bin(self.live).count("1")
+        self.history = []
+
+    def ordered_moves(self, history=None):
+        # Move indices with the best immediate swing first. Within a class, moves with a higher
+        # history score come first when a history table is given, otherwise left to right.
+        # A move that leads to the same string as an earlier one is left out, so every distinct
+        # child is searched once and the index kept is always a legal move of this board.
+        cells = self.cells
+        last_index = self.length - 1
+        shift = 4 * (last_index - 1)
+        children = set()
+        first, last = [], []
+        for i in range(last_index):
+            pair = (cells >> shift) & 255
+            if PAIR_MAY_REPEAT[pair]:
+                child = ((((cells >> (shift + 8)) << 4) | PAIR_REPLACEMENT[pair]) << shift) | (cells & ((1 << shift) - 1))
+                if child in children:
+                    shift -= 4
+                    continue
+                children.add(child)
+            if history is not None:
+                first.append((PAIR_ORDER[pair], -history[pair * HISTORY_BUCKETS + i * HISTORY_BUCKETS // last_index], i))
+            elif PAIR_ORDER[pair]:
+                last.append(i)
+            else:
+                first.append(i)
+            shift -= 4
+        if history is not None:
+            first.sort()
+            return [i for _, _, i in first]
+        return first + last
+
+    def history_index(self, i, pair):
+        # Slot of move i, merging the packed pair, in a history table
+        return pair * HISTORY_BUCKETS + i * HISTORY_BUCKETS // (self.length - 1)
+
+    def make(self, i):
+        # Merge digits i and i + 1 and return the change in the mover's score difference
+        cells = self.cells
+        shift = 4 * (self.length - i - 2)
+        pair = (cells >> shift) & 255
+        delta = PAIR_DELTA[pair]
+        replacement = PAIR_REPLACEMENT[pair]
+        reversed_cells = self.reversed_cells
+        live = self.live
+        self.history.append((i, delta, cells, reversed_cells, live))
+        self.cells = ((((cells >> (shift + 8)) << 4) | replacement) << shift) | (cells & ((1 << shift) - 1))
+        # In the reversed string the same pair sits at index length - 2 - i
+        shift = 4 * i
+        self.reversed_cells = ((((reversed_cells >> (shift + 8)) << 4) | replacement) << shift) | (reversed_cells & ((1 << shift) - 1))
+        self.length -= 1
+        # The merged cell is a 1-3, and the cells after it move down one place
+        self.mid_digits -= LIVE_COUNT[(live >> i) & 3]
+        self.live = (live & ((1 << i) - 1)) | ((live >> (i + 2)) << (i + 1))
+        return delta
+
+    def unmake(self):
+        # Take back the last move
+        i, delta, self.cells, self.reversed_cells, self.live = self.history.pop()
+        self.length += 1
+        self.mid_digits += LIVE_COUNT[(self.live >> i) & 3]
+
+    def table_key(self):
+        # Transposition table key, and whether it is the reversed string. A string and its reverse
+        # have the same value with mirrored moves, so only the lexicographically smaller
+        # orientation (the smaller packed int, first digit highest) is stored.
+        if self.reversed_cells < self.cells:
+            return self.reversed_cells, True
+        return self.cells, False
+
 class NumberGame:
     def __init__(self, root):
         # Initialize the game with a tkinter window (root)
@@ -19,7 +246,41 @@ class NumberGame:
 
         # AI-related variables
         self.algorithm = "Minimax"
-        self.max_depth = 2
+        self.max_depth = MAX_STRING_LENGTH - 1  # Upper bound for iterative deepening
+        self.time_budget = 1.0  # Seconds the computer may think per move
+        self.perfect_time_budget = 5.0  # Seconds Perfect, and grading a move, may spend solving to the end
+        self.deadline = float('inf')
+        self.search_depth = 0  # Depth of the last completed iteration
+        self.reset_search_stats()  # Counters for the last computer move
+        self.endgame_threshold = 12  # Strings this short are solved exactly instead
+        self.proven_value = None  # Final score difference proven by the last exact solve
+        self.grade_moves = False  # Report how far each computer move falls short of perfect play
+        self.analysis_depth = 6  # Depth of hints and Easy moves on strings too long to solve outright
+        self.easy_margin = 2  # Easy picks at random among moves at most this far below the best
+        self.late_move_index = 3  # Moves from this index on are searched at reduced depth first
+        self.reduce_late_moves = False  # Only set while the computer picks its move by alpha-beta
+
+        # Move ordering memory for alpha-beta: two killer move indices per ply, and a history
+        # score per (pair, position slice) for moves that caused a beta cutoff
+        self.killer_moves = [[None, None] for _ in range(MAX_STRING_LENGTH)]
+        self.history_table = [0] * (256 * HISTORY_BUCKETS)
+
+        # Transposition table: packed board -> (depth, bound type, negamax value, best move index).
+        # Negamax values are the same for either side to move, so the side is not part of the key.
+        # Positions are stored in the orientation Board.table_key picks, with the move index to match.
+        self.transposition_table = {}
+        self.tt_max_entries = 2000000
+
+        # Live 4-6 digit mask of the last string a search started from, so the MergeAnalysis of a
+        # position is run once however many searches and re-searches start from it
+        self.live_string = None
+        self.live_mask = 0
+
+        # Precomputed values and best moves of every string up to tablebase_length digits, built by
+        # Tablebase.py. Only the list of lengths on disk is read here; the tables are memory-mapped
+        # the first time they are probed.
+        self.tablebase = Tablebase(TABLEBASE_DIRECTORY) if Tablebase is not None else None
+        self.tablebase_length = self.tablebase.max_length if self.tablebase is not None else 0
 
         # Metrics tracking for the entire game
         self.total_nodes = 0
@@ -42,14 +303,24 @@ class NumberGame:
         self.radio_human.pack()
         self.radio_computer.pack()
 
-        # Radio buttons to choose AI algorithm (Minimax or Alpha-Beta)
-        self.label_algorithm = tk.Label(root, text="Choose AI algorithm (Minimax/Alpha-Beta):")
+        # Radio buttons to choose AI algorithm (Minimax, Alpha-Beta, Principal Variation Search, MTD(f),
+        # Perfect, which solves every move to the end of the game when it can within perfect_time_budget,
+        # or Easy, which picks among the near-best moves)
+        self.label_algorithm = tk.Label(root, text="Choose AI algorithm (Minimax/Alpha-Beta/PVS/MTD(f)/Perfect/Easy):")
         self.label_algorithm.pack()
         self.var_algorithm = tk.StringVar(value="Minimax")  # Default to Minimax
         self.radio_minimax = tk.Radiobutton(root, text="Minimax", variable=self.var_algorithm, value="Minimax")
         self.radio_alphabeta = tk.Radiobutton(root, text="Alpha-Beta", variable=self.var_algorithm, value="AlphaBeta")
+        self.radio_pvs = tk.Radiobutton(root, text="PVS", variable=self.var_algorithm, value="PVS")
+        self.radio_mtdf = tk.Radiobutton(root, text="MTD(f)", variable=self.var_algorithm, value="MTDF")
+        self.radio_perfect = tk.Radiobutton(root, text="Perfect", variable=self.var_algorithm, value="Perfect")
+        self.radio_easy = tk.Radiobutton(root, text="Easy", variable=self.var_algorithm, value="Easy")
         self.radio_minimax.pack()
         self.radio_alphabeta.pack()
+        self.radio_pvs.pack()
+        self.radio_mtdf.pack()
+        self.radio_perfect.pack()
+        self.radio_easy.pack()
 
         # Button to start the game
         self.start_button = tk.Button(root, text="Start Game", command=self.start_game)
@@ -59,6 +330,10 @@ class NumberGame:
         self.new_game_button = tk.Button(root, text="New Game", command=self.start_game, state=tk.DISABLED)
         self.new_game_button.pack()
 
+        # Button to show the human's best moves (enabled only on the human's turn)
+        self.hint_button = tk.Button(root, text="Hint", command=self.show_hint, state=tk.DISABLED)
+        self.hint_button.pack()
+
         # Labels to display the number string, scores, and instructions
         self.label_string = tk.Label(root, text="Number String: ")
         self.label_string.pack()
@@ -75,124 +350,435 @@ class NumberGame:
 
         self.number_buttons = []  # List to store the buttons for each number
 
+    def reset_search_stats(self):
+        # Counters reported after each computer move
+        self.search_stats = {'re-searches': 0, 'mtdf passes': 0, 'aspiration fail-lows': 0, 'aspiration fail-highs': 0,
+                             'reductions': 0, 'reduction re-searches': 0}
+
     def evaluate_state(self, num_string, player_score, computer_score, is_maximizing):
         # Heuristic function to evaluate a game state
-        score_diff = computer_score - player_score if is_maximizing else player_score - computer_score
-        return score_diff
-
-    def generate_moves(self, num_string, player_score, computer_score, current_player):
-        moves = []
-        for i in range(len(num_string) - 1):
-            new_num_string = num_string[:]
-            first_num, second_num = new_num_string[i], new_num_string[i + 1]
-            sum_nums = first_num + second_num
-
-            if sum_nums > 7:
-                replacement = 1
-                new_player_score = player_score + (1 if current_player == "Human" else 0)
-                new_computer_score = computer_score + (1 if current_player == "Computer" else 0)
-            elif sum_nums < 7:
-                replacement = 3
-                new_player_score = player_score - (1 if current_player == "Computer" else 0)
-                new_computer_score = computer_score - (1 if current_player == "Human" else 0)
-            else:
-                replacement = 2
-                new_player_score = player_score - (1 if current_player == "Human" else 0)
-                new_computer_score = computer_score - (1 if current_player == "Computer" else 0)
-
-            new_num_string.pop(i)
-            new_num_string.pop(i)
-            new_num_string.insert(i, replacement)
+        # Always from the computer's point of view, since the computer is the maximizing side at the root.
+        # Scored as if no pair sums to 7 from here on, which is exact once no live 4-6 digit is left
+        score_diff = computer_score - player_score
+        tail = (len(num_string) - 1) & 1
+        return score_diff + tail if is_maximizing else score_diff - tail
+
+    def store_position(self, key, depth, flag, value, best_index):
+        # Keep the deeper result when a position is already stored
+        entry = self.transposition_table.get(key)
+        if entry is not None and entry[0] > depth:
+            return
+        if entry is None and len(self.transposition_table) >= self.tt_max_entries:
+            self.transposition_table.clear()
+        self.transposition_table[key] = (depth, flag, value, best_index)
+
+    def negamax(self, board, depth, alpha, beta, node_count, prune=True, scout=False):
+        # Score-independent search: the value is how much the side to move gains on its opponent
+        # from here on, so it only depends on the board. With scout set this is Principal Variation
+        # Search: moves after the first only get a null window, and are searched again if they beat alpha.
+        node_count[0] += 1
+        if node_count[0] & 1023 == 0 and time.time() > self.deadline:
+            raise SearchTimeout()
+        length = board.length
+        # Closed form once no 7-sum can come (see MERGE_TABLE); the horizon is scored the same way
+        mid_digits = board.mid_digits
+        if depth == 0 or mid_digits == 0 or length <= 1:
+            return (length - 1) & 1
+        # The tablebase holds values to the end of the game, which is what the search would find
+        # once the horizon is past it
+        if length <= self.tablebase_length and depth >= length - 1:
+            return self.tablebase.probe(board.cells, length)[0]
+
+        if prune:
+            # Each 7-sum costs whoever plays it 2. There can be at most one 7-sum per live 4-6
+            # digit left, and no more for a side than it has moves before the horizon. A window outside
+            # the resulting range is already decided, and one that overlaps it is narrowed to it.
+            moves_left = depth if depth < length - 1 else length - 1
+            own_moves = (moves_left + 1) >> 1
+            other_moves = moves_left >> 1
+            lower = ((length - 1) & 1) - 2 * (mid_digits if mid_digits < own_moves else own_moves)
+            upper = ((length - 1) & 1) + 2 * (mid_digits if mid_digits < other_moves else other_moves)
+            if upper <= alpha:
+                return upper
+            if lower >= beta:
+                return lower
+            if alpha < lower:
+                alpha = lower
+            if beta > upper:
+                beta = upper
+
+        # Same as board.table_key(), inlined on the hot path
+        mirrored = board.reversed_cells < board.cells
+        key = board.reversed_cells if mirrored else board.cells
+        best_index = None
+        entry = self.transposition_table.get(key)
+        if entry is not None:
+            entry_depth, flag, stored_value, best_index = entry
+            if mirrored and best_index is not None:
+                best_index = length - 2 - best_index
+            if entry_depth >= depth:
+                if flag == TT_EXACT:
+                    return stored_value
+                if flag == TT_LOWER and stored_value >= beta:
+                    return stored_value
+                if flag == TT_UPPER and stored_value <= alpha:
+                    return stored_value
+
+        alpha_orig = alpha
+        if prune and depth > 2:
+            # Killer moves of this ply go before the rest, and the stored best move before those.
+            # Close to the horizon the subtrees are too small to pay for the sort.
+            indices = board.ordered_moves(self.history_table)
+            killers = self.killer_moves[len(board.history)]
+            for i in (killers[1], killers[0], best_index):
+                if i in indices:
+                    indices.remove(i)
+                    indices.insert(0, i)
+        else:
+            indices = board.ordered_moves()
+            if best_index in indices:
+                indices.remove(best_index)
+                indices.insert(0, best_index)
+
+        # Late-move reductions: moves from late_move_index on are first searched two plies short
+        # with a null window at alpha, and only searched in full if that beats alpha. Never in a
+        # search that reaches the end of the game, which has to stay exact.
+        if self.reduce_late_moves and prune and 2 < depth < length - 1:
+            reduce_from = self.late_move_index
+        else:
+            reduce_from = length
 
-            moves.append({
-                'num_string': new_num_string,
-                'player_score': new_player_score,
-                'computer_score': new_computer_score,
-                'move': (i, i + 1)
-            })
-        return moves
+        best_value = float('-inf')
+        for move_number, i in enumerate(indices):
+            delta = board.make(i)
+            full_search = True
+            if move_number >= reduce_from:
+                self.search_stats['reductions'] += 1
+                value = delta - self.negamax(board, depth - 2, delta - alpha - 1, delta - alpha, node_count, prune, scout)
+                full_search = value > alpha
+                if full_search:
+                    self.search_stats['reduction re-searches'] += 1
+            if full_search:
+                if scout and best_value > float('-inf'):
+                    value = delta - self.negamax(board, depth - 1, delta - alpha - 1, delta - alpha, node_count, prune, scout)
+                    if alpha < value < beta:
+                        self.search_stats['re-searches'] += 1
+                        value = delta - self.negamax(board, depth - 1, delta - beta, delta - alpha, node_count, prune, scout)
+                else:
+                    value = delta - self.negamax(board, depth - 1, delta - beta, delta - alpha, node_count, prune, scout)
+            board.unmake()
+            if value > best_value:
+                best_value = value
+                best_index = i
+                if prune and value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.record_cutoff(board, i, depth)
+                        break
+
+        if best_value <= alpha_orig:
+            flag = TT_UPPER
+        elif best_value >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self.store_position(key, depth, flag, best_value, length - 2 - best_index if mirrored else best_index)
+        return best_value
+
+    def record_cutoff(self, board, i, depth):
+        # Remember move i, which caused a beta cutoff in the current position of board
+        killers = self.killer_moves[len(board.history)]
+        if killers[0] != i:
+            killers[1] = killers[0]
+            killers[0] = i
+        pair = (board.cells >> (4 * (board.length - i - 2))) & 255
+        self.history_table[board.history_index(i, pair)] += depth * depth
+
+    def make_board(self, num_string):
+        # Board for a search to start from, reusing the live mask when the string is the same
+        if num_string != self.live_string:
+            self.live_string = list(num_string)
+            self.live_mask = MergeAnalysis([7 if digit > 7 else digit for digit in num_string]).live_mid_digits()
+        return Board(num_string, self.live_mask)
 
     def minimax(self, num_string, player_score, computer_score, depth, is_maximizing, current_player, node_count=[0]):
         # Minimax algorithm to evaluate the best move
-        node_count[0] += 1
-        if depth == 0 or len(num_string) <= 1:
-            return self.evaluate_state(num_string, player_score, computer_score, is_maximizing)
+        # The score difference is added once here, on top of the score-independent negamax value
+        score_diff = computer_score - player_score
+        board = self.make_board(num_string)
+        value = self.negamax(board, depth, float('-inf'), float('inf'), node_count, False)
+        return score_diff + value if is_maximizing else score_diff - value
 
-        moves = self.generate_moves(num_string, player_score, computer_score, current_player)
-        next_player = "Human" if current_player == "Computer" else "Computer"
-
-        if is_maximizing:
-            best_value = float('-inf')
-            for move in moves:
-                value = self.minimax(
-                    move['num_string'], move['player_score'], move['computer_score'],
-                    depth - 1, False, next_player, node_count
-                )
-                best_value = max(best_value, value)
-            return best_value
-        else:
-            best_value = float('inf')
-            for move in moves:
-                value = self.minimax(
-                    move['num_string'], move['player_score'], move['computer_score'],
-                    depth - 1, True, next_player, node_count
-                )
-                best_value = min(best_value, value)
-            return best_value
-
-    def alpha_beta(self, num_string, player_score, computer_score, depth, alpha, beta, is_maximizing, current_player, node_count=[0]):
+    def alpha_beta(self, num_string, player_score, computer_score, depth, alpha, beta, is_maximizing, current_player, node_count=[0], win_loss_draw=False):
         # Alpha-Beta pruning algorithm to evaluate the best move
-        node_count[0] += 1
-        if depth == 0 or len(num_string) <= 1:
-            return self.evaluate_state(num_string, player_score, computer_score, is_maximizing)
-
-        moves = self.generate_moves(num_string, player_score, computer_score, current_player)
-        next_player = "Human" if current_player == "Computer" else "Computer"
+        # The (alpha, beta) window is in computer score differences; negamax works from the side to move
+        # With win_loss_draw set the window is ignored and the result is only whether the computer
+        # finishes ahead (1), level (0) or behind (-1), from at most two null-window searches around 0
+        if win_loss_draw:
+            if self.alpha_beta(num_string, player_score, computer_score, depth, 0, 1, is_maximizing, current_player, node_count) >= 1:
+                return 1
+            # A level finish needs an even final difference, whose parity is fixed (see MERGE_TABLE)
+            if (computer_score - player_score + len(num_string) - 1) & 1:
+                return -1
+            if self.alpha_beta(num_string, player_score, computer_score, depth, -1, 0, is_maximizing, current_player, node_count) >= 0:
+                return 0
+            return -1
+        score_diff = computer_score - player_score
+        board = self.make_board(num_string)
+        if is_maximizing:
+            return score_diff + self.negamax(board, depth, alpha - score_diff, beta - score_diff, node_count)
+        return score_diff - self.negamax(board, depth, score_diff - beta, score_diff - alpha, node_count)
 
+    def pvs(self, num_string, player_score, computer_score, depth, alpha, beta, is_maximizing, current_player, node_count=[0]):
+        # Principal Variation Search (NegaScout): alpha_beta with null windows after the first move
+        score_diff = computer_score - player_score
+        board = self.make_board(num_string)
         if is_maximizing:
-            value = float('-inf')
-            for move in moves:
-                value = max(value, self.alpha_beta(
-                    move['num_string'], move['player_score'], move['computer_score'],
-                    depth - 1, alpha, beta, False, next_player, node_count
-                ))
-                alpha = max(alpha, value)
-                if beta <= alpha:
-                    break
-            return value
-        else:
-            value = float('inf')
-            for move in moves:
-                value = min(value, self.alpha_beta(
-                    move['num_string'], move['player_score'], move['computer_score'],
-                    depth - 1, alpha, beta, True, next_player, node_count
-                ))
-                beta = min(beta, value)
-                if beta <= alpha:
+            return score_diff + self.negamax(board, depth, alpha - score_diff, beta - score_diff, node_count, True, True)
+        return score_diff - self.negamax(board, depth, score_diff - beta, score_diff - alpha, node_count, True, True)
+
+    def search_root(self, depth, first_move, node_count, alpha=float('-inf'), beta=float('inf')):
+        # One fixed-depth search from the current position, trying first_move before the others.
+        # The window is in computer score differences; a result at or below alpha is only an upper
+        # bound and a result at or above beta only a lower bound.
+        board = self.make_board(self.num_string)
+        best_value = float('-inf')
+        best_move = None
+
+        # A search to the end of the game has the same answer with or without pruning, so Minimax
+        # only goes unpruned when it stops at a horizon
+        prune = self.algorithm != "Minimax" or depth >= board.length - 1
+        scout = self.algorithm == "PVS"
+        score_diff = self.computer_score - self.player_score
+        indices = board.ordered_moves()
+        root_key, mirrored = board.table_key()
+        if first_move is None:
+            entry = self.transposition_table.get(root_key)
+            if entry is not None and entry[3] is not None:
+                i = board.length - 2 - entry[3] if mirrored else entry[3]
+                first_move = (i, i + 1)
+        if first_move is not None and first_move[0] in indices:
+            # Try the expected best move first so the rest of the root is searched with a tight alpha
+            indices.remove(first_move[0])
+            indices.insert(0, first_move[0])
+
+        for i in indices:
+            delta = board.make(i)
+            offset = score_diff + delta
+            # Only a reply that beats the current best value needs an exact answer
+            floor = max(alpha, best_value) if prune else float('-inf')
+            if scout and best_move is not None:
+                value = offset - self.negamax(board, depth - 1, offset - floor - 1, offset - floor, node_count, True, True)
+                if floor < value < beta:
+                    self.search_stats['re-searches'] += 1
+                    value = offset - self.negamax(board, depth - 1, offset - beta, offset - floor, node_count, True, True)
+            else:
+                value = offset - self.negamax(board, depth - 1, offset - beta, offset - floor, node_count, prune, scout)
+            board.unmake()
+            if value > best_value:
+                best_value = value
+                best_move = (i, i + 1)
+                if prune and value >= beta:
                     break
-            return value
+
+        if best_move is not None:
+            if best_value <= alpha:
+                flag = TT_UPPER
+            elif best_value >= beta:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            i = board.length - 2 - best_move[0] if mirrored else best_move[0]
+            self.store_position(root_key, depth, flag, best_value - score_diff, i)
+        return best_value, best_move
+
+    def aspiration_search(self, depth, guess, first_move, node_count):
+        # Search the root in a narrow window around the previous iteration's value. A fail-soft
+        # result outside the window bounds the true value, so only the failing side is widened,
+        # by twice as much each time.
+        width = ASPIRATION_WINDOW
+        alpha, beta = guess - width, guess + width
+        while True:
+            value, move = self.search_root(depth, first_move, node_count, alpha, beta)
+            if value <= alpha:
+                self.search_stats['aspiration fail-lows'] += 1
+                alpha, beta = value - 2 * width, value + 1
+            elif value >= beta:
+                self.search_stats['aspiration fail-highs'] += 1
+                alpha, beta = value - 1, value + 2 * width
+                first_move = move
+            else:
+                return value, move
+            width *= 2
+
+    def mtdf(self, depth, first_guess, first_move, node_count):
+        # MTD(f): converge on the value of the current position with null-window searches that lean
+        # on the transposition table. Scores are small integers, so a few passes are enough.
+        # Returns the value and the move of the last pass that failed high, which proved it.
+        value = first_guess
+        best_move = first_move
+        lower, upper = float('-inf'), float('inf')
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            self.search_stats['mtdf passes'] += 1
+            value, move = self.search_root(depth, best_move, node_count, beta - 1, beta)
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+                best_move = move
+        return value, best_move
+
+    def solve_endgame(self, node_count):
+        # Proven-optimal move for the computer and the final score difference it leads to: MTD(f)
+        # searched to the end of the game, with no time limit. The transposition table is the memo
+        # of solved positions, so memory stays within tt_max_entries.
+        board = self.make_board(self.num_string)
+        if board.length <= self.tablebase_length:
+            node_count[0] += 1
+            value, i = self.tablebase.probe(board.cells, board.length)
+            return self.computer_score - self.player_score + value, (i, i + 1)
+        guess = self.computer_score - self.player_score + ((board.length - 1) & 1)
+        return self.mtdf(board.length - 1, guess, None, node_count)
+
+    def move_loss(self, move):
+        # Oracle for grading the depth-limited searches: how much worse the final score difference
+        # is after move than after the best move, both solved exactly. None if that takes longer
+        # than perfect_time_budget.
+        self.deadline = time.time() + self.perfect_time_budget
+        try:
+            best_value = self.solve_endgame([0])[0]
+            board = self.make_board(self.num_string)
+            offset = self.computer_score - self.player_score + board.make(move[0])
+            value = offset - self.negamax(board, board.length - 1, float('-inf'), float('inf'), [0])
+        except SearchTimeout:
+            return None
+        finally:
+            self.deadline = float('inf')
+        return best_value - value
+
+    def top_moves(self, k, depth, node_count):
+        # Multi-PV analysis: the k best moves for the side to move in the current position, best
+        # first, as (value, move) pairs where value is how much the mover gains on its opponent
+        # from here at the given depth. Ties keep the earlier move. Once k moves are in, the rest
+        # are searched with alpha at the k-th best value: a move that fails low cannot make the
+        # list, and one that beats alpha comes back exact. The transposition table carries over
+        # what earlier searches found, including which move to try first.
+        board = self.make_board(self.num_string)
+        indices = board.ordered_moves()
+        root_key, mirrored = board.table_key()
+        entry = self.transposition_table.get(root_key)
+        if entry is not None and entry[3] is not None:
+            i = board.length - 2 - entry[3] if mirrored else entry[3]
+            if i in indices:
+                indices.remove(i)
+                indices.insert(0, i)
+        # Moves that lead to the same string as an earlier one still count as moves of their own here
+        indices += [i for i in range(board.length - 1) if i not in indices]
+        ranked = []
+        alpha = float('-inf')
+        for i in indices:
+            delta = board.make(i)
+            value = delta - self.negamax(board, depth - 1, float('-inf'), delta - alpha, node_count)
+            board.unmake()
+            if value > alpha:
+                position = len(ranked)
+                while position > 0 and ranked[position - 1][0] < value:
+                    position -= 1
+                ranked.insert(position, (value, (i, i + 1)))
+                del ranked[k:]
+                if len(ranked) == k:
+                    alpha = ranked[-1][0]
+        return ranked
+
+    def analysis_search_depth(self):
+        # Short strings are analysed to the end of the game, longer ones to analysis_depth
+        if len(self.num_string) <= self.endgame_threshold:
+            return len(self.num_string) - 1
+        return min(self.analysis_depth, len(self.num_string) - 1)
+
+    def prove_outcome(self, num_string, player_score, computer_score):
+        # Whether the computer, to move in this position, wins, ties or loses with best play from
+        # both sides, without working out by how much. Returns ("Win" | "Tie" | "Loss", a move that
+        # secures it, or None for a loss). Each move gets one null-window search to the end of the
+        # game, which only has to show whether the reply can keep the computer below the target, and
+        # the first move that cannot be kept below it is the one returned.
+        score_diff = computer_score - player_score
+        board = self.make_board(num_string)
+        if board.length <= 1:
+            return ("Win" if score_diff > 0 else "Tie" if score_diff == 0 else "Loss"), None
+        node_count = [0]
+        for outcome, target in (("Win", 1), ("Tie", 0)):
+            # A level finish needs an even final difference, whose parity is fixed (see MERGE_TABLE)
+            if target == 0 and (score_diff + board.length - 1) & 1:
+                continue
+            for i in board.ordered_moves():
+                cutoff = score_diff + board.make(i) - target
+                reply = self.negamax(board, board.length - 1, cutoff, cutoff + 1, node_count)
+                board.unmake()
+                if reply <= cutoff:
+                    return outcome, (i, i + 1)
+        return "Loss", None
 
     def find_best_move(self):
-        moves = self.generate_moves(self.num_string, self.player_score, self.computer_score, "Computer")
-        best_value = float('-inf')
         best_move = None
         node_count = [0]
         start_time = time.time()
 
-        for move in moves:
-            if self.algorithm == "Minimax":
-                value = self.minimax(
-                    move['num_string'], move['player_score'], move['computer_score'],
-                    self.max_depth - 1, False, "Human", node_count
-                )
-            else:
-                value = self.alpha_beta(
-                    move['num_string'], move['player_score'], move['computer_score'],
-                    self.max_depth - 1, float('-inf'), float('inf'), False, "Human", node_count
-                )
-            if value > best_value:
-                best_value = value
-                best_move = move['move']
+        self.proven_value = None
+        self.reset_search_stats()
+        # Killers are tied to plies of this search; history scores fade from one move to the next
+        self.killer_moves = [[None, None] for _ in range(MAX_STRING_LENGTH)]
+        self.history_table = [score // 2 for score in self.history_table]
+        if self.algorithm == "Easy":
+            # A random pick among the moves close to the best, from one multi-PV search
+            self.search_depth = self.analysis_search_depth()
+            ranked = self.top_moves(3, self.search_depth, node_count)
+            best_move = random.choice([move for value, move in ranked if value >= ranked[0][0] - self.easy_margin])
+            return best_move, node_count[0], time.time() - start_time
+        if len(self.num_string) <= max(self.endgame_threshold, self.tablebase_length):
+            # Short enough to solve outright instead of searching to a horizon
+            self.proven_value, best_move = self.solve_endgame(node_count)
+            self.search_depth = len(self.num_string) - 1
+            return best_move, node_count[0], time.time() - start_time
+
+        # Iterative deepening: each iteration starts from the previous principal variation, which
+        # the transposition table hands back as the stored best move of every position on it.
+        # Only completed iterations count, and once the search reaches the end of the game a
+        # deeper one would return the same answer.
+        perfect = self.algorithm == "Perfect"
+        self.deadline = start_time + self.time_budget
+        self.search_depth = 0
+        self.reduce_late_moves = self.algorithm not in ("Minimax", "Perfect")
+        best_value = self.evaluate_state(self.num_string, self.player_score, self.computer_score, True)
+        try:
+            for depth in range(1, min(self.max_depth, len(self.num_string) - 1) + 1):
+                if self.algorithm in ("MTDF", "Perfect"):
+                    best_value, best_move = self.mtdf(depth, best_value, best_move, node_count)
+                elif self.algorithm != "Minimax" and depth > 1:
+                    best_value, best_move = self.aspiration_search(depth, best_value, best_move, node_count)
+                else:
+                    best_value, best_move = self.search_root(depth, best_move, node_count)
+                self.search_depth = depth
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = float('inf')
+            self.reduce_late_moves = False
+
+        if perfect and self.search_depth == len(self.num_string) - 1:
+            self.proven_value = best_value
+        elif perfect:
+            # Perfect then solves to the end of the game with what is left of perfect_time_budget,
+            # keeping the move from the last completed iteration if that runs out
+            self.deadline = start_time + self.perfect_time_budget
+            try:
+                self.proven_value, best_move = self.solve_endgame(node_count)
+                self.search_depth = len(self.num_string) - 1
+            except SearchTimeout:
+                pass
+            finally:
+                self.deadline = float('inf')
 
         end_time = time.time()
         time_taken = end_time - start_time
@@ -213,6 +799,7 @@ class NumberGame:
         self.total_nodes = 0
         self.total_time = 0.0
         self.move_count = 0
+        self.transposition_table.clear()
 
         self.string_length = length
         self.num_string = [random.randint(1, 9) for _ in range(self.string_length)]
@@ -237,6 +824,7 @@ class NumberGame:
 
         self.new_game_button.config(state=tk.NORMAL)
         self.start_button.config(state=tk.DISABLED)
+        self.hint_button.config(state=tk.NORMAL if self.current_player == "Human" else tk.DISABLED)
 
         if self.current_player == "Computer":
             self.root.after(1000, self.computer_move)
@@ -309,11 +897,27 @@ class NumberGame:
                 self.number_buttons.append(button)
 
             self.current_player = "Computer"
+            self.hint_button.config(state=tk.DISABLED)
             print(f"Turn switched to {self.current_player} after move")
             self.label_instruction.config(text=f"{'Human' if self.current_player == 'Human' else 'Computer'}'s turn: Select two adjacent numbers:")
             self.selected_index = None
             self.root.after(1000, self.computer_move)
 
+    def show_hint(self):
+        # Show the human's three best moves and where each leads
+        if self.current_player != "Human" or len(self.num_string) <= 1:
+            print("Hints are only available on the player's turn")
+            return
+        depth = self.analysis_search_depth()
+        ranked = self.top_moves(3, depth, [0])
+        lines = []
+        for value, (move_start, move_end) in ranked:
+            final_diff = self.player_score - self.computer_score + value
+            lines.append(f"{self.num_string[move_start]} + {self.num_string[move_end]} at positions {move_start}, {move_end}: "
+                         f"Player - Computer ends at {final_diff}")
+        exact = "with perfect play" if depth == len(self.num_string) - 1 else f"looking {depth} moves ahead"
+        messagebox.showinfo("Hint", f"Best moves {exact}:\n" + "\n".join(lines))
+
     def computer_move(self):
         print(f"Computer move starting, current state: {self.num_string}")
         if len(self.num_string) <= 1:
@@ -331,7 +935,16 @@ class NumberGame:
             move_end = move_start + 1
         else:
             move_start, move_end = move
-            print(f"Best move found: indices {move_start}, {move_end}")
+            print(f"Best move found: indices {move_start}, {move_end} (search depth {self.search_depth})")
+        print(f"Nodes visited: {nodes_visited}, search stats: {self.search_stats}")
+        if self.proven_value is not None:
+            print(f"Endgame solved: final score difference (Computer - Player) will be {self.proven_value}")
+        elif self.grade_moves and move is not None:
+            loss = self.move_loss(move)
+            if loss is None:
+                print("Move not graded: solving the position took too long")
+            else:
+                print(f"Perfect play would finish {loss} better than this move")
 
         first_num = self.num_string[move_start]
         second_num = self.num_string[move_end]
@@ -375,6 +988,7 @@ class NumberGame:
             self.number_buttons.append(button)
 
         self.current_player = "Human"
+        self.hint_button.config(state=tk.NORMAL)
         print(f"Turn switched to {self.current_player} after computer move")
         self.label_instruction.config(text=f"{'Human' if self.current_player == 'Human' else 'Computer'}'s turn: Select two adjacent numbers:")
 
@@ -390,6 +1004,7 @@ class NumberGame:
         self.label_instruction.config(text="Select two adjacent numbers:")
         self.new_game_button.config(state=tk.NORMAL)
         self.start_button.config(state=tk.NORMAL)
+        self.hint_button.config(state=tk.DISABLED)
         # Reset metrics for the next game
         self.total_nodes = 0
         self.total_time = 0.0